@@ -0,0 +1,81 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compare full and incremental republishing of home tabs when 5% of blocks change
+
+Both paths validate each block they render and build the view dictionary directly.
+Run with ``PYTHONPATH=. python benchmarks/bench_publish.py`` from the top of the source tree.
+"""
+
+import time
+
+from blockkit import HomeTabPublisher, Section, Context, Header, Text
+
+USERS = 20000
+SHARED_BLOCKS = 16
+USER_BLOCKS = 4
+
+
+def render(key, inputs):
+    """Render one block of a home tab from its inputs"""
+    kind, index = key
+    if kind == "header":
+        return Header(text="Team dashboard ({})".format(inputs))
+    if kind == "shared":
+        return Section(text=Text("*Project {}*: status {}".format(index, inputs), Text.MARKDOWN),
+                       fields=["Owner: team {}".format(index), "Revision {}".format(inputs)])
+    return Context(elements=[Text("Your task {} for {}".format(index, inputs))])
+
+
+def home_tab(user, version):
+    """Return the (key, inputs) description of a user's home tab"""
+    blocks = [(("header", 0), "v1")]
+    # One shared block in twenty changes between versions
+    blocks.extend((("shared", i), version if i == 0 else 1) for i in range(SHARED_BLOCKS - 1))
+    blocks.extend((("user", i), user) for i in range(USER_BLOCKS))
+    return blocks
+
+
+def full_publish(version):
+    """Render every block for every user, as a naive republish would"""
+    payloads = []
+    for user in range(USERS):
+        view = {"type": "home",
+                "blocks": [render(key, inputs).asdict() for key, inputs in home_tab(user, version)]}
+        payloads.append({"user_id": "U{}".format(user), "view": view})
+    return payloads
+
+
+def main():
+    """Run the benchmark and print the time for each republish"""
+    batches = []
+    publisher = HomeTabPublisher(render, batches.append)
+    for user in range(USERS):
+        publisher.update("U{}".format(user), home_tab(user, 1))
+    publisher.flush()
+    batches.clear()
+
+    start = time.perf_counter()
+    for user in range(USERS):
+        publisher.update("U{}".format(user), home_tab(user, 2))
+    publisher.flush()
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full_publish(2)
+    full = time.perf_counter() - start
+
+    print("Users: {}, payloads sent in {} batches".format(USERS, len(batches)))
+    print("Full republish:        {:6.2f} s".format(full))
+    print("Incremental republish: {:6.2f} s".format(incremental))
+    print("Speed-up:              {:6.1f}x".format(full / incremental))
+
+
+if __name__ == "__main__":
+    main()
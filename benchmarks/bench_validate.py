@@ -0,0 +1,55 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Compare raw dictionary validation with full object construction for a 50 block message
+
+Run with ``PYTHONPATH=. python benchmarks/bench_validate.py`` from the top of the source tree.
+"""
+
+import timeit
+
+from blockkit import (
+    Message, Section, Actions, Context, Divider, Header, Text, Button, Confirm, Image,
+    StaticSelect, Option, validate)
+
+
+def build_message(blocks=50):
+    """Build a realistic message, mixing the common block types"""
+    result = []
+    for i in range(blocks // 5):
+        result.append(Header(text="Item {}".format(i), block_id="h{}".format(i)))
+        result.append(Section(text=Text("*Item {}* is ready for review".format(i), Text.MARKDOWN),
+                              fields=["Owner: someone", "Due: tomorrow"]))
+        result.append(Context(elements=[Image(image_url="https://example.com/a.png",
+                                              alt_text="avatar"),
+                                        Text("Updated 5 minutes ago")]))
+        result.append(Actions(elements=[
+            Button(text="Approve", action_id="approve_{}".format(i), style="primary",
+                   confirm=Confirm("Sure?", "Really approve?", "Yes", "No")),
+            StaticSelect(placeholder="Assign", action_id="assign_{}".format(i),
+                         options=[Option(text="User {}".format(n), value=str(n))
+                                  for n in range(5)])]))
+        result.append(Divider())
+    return Message(channel="C0123456", blocks=result, text="Review queue")
+
+
+def main(number=200):
+    """Run the benchmark and print the time per message"""
+    payload = build_message().asdict()
+    validate(payload, Message)
+
+    construct = timeit.timeit(build_message, number=number) / number
+    check = timeit.timeit(lambda: validate(payload, Message), number=number) / number
+    print("Object construction: {:8.1f} us per message".format(construct * 1e6))
+    print("Raw validation:      {:8.1f} us per message".format(check * 1e6))
+    print("Speed-up:            {:8.1f}x".format(construct / check))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,5 +18,9 @@ from .elements import (
     ChannelsSelect, TimePicker )
 from .blocks import Actions, Context, Divider, File, Header, ImageBlock, Input, Section
 from .messages import Message
+from .views import View, Modal, HomeTab
+from .publish import HomeTabPublisher
+from .cache import RenderCache, content_hash
+from .schema import ValidationError, json_schema, compile_validator, validate
 
 __version__ = "0.2.0"
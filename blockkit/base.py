@@ -50,6 +50,7 @@ class Component:
     def __init_subclass__(cls, *args, **kwargs):
         params = [inspect.Parameter("self", inspect.Parameter.POSITIONAL_ONLY)]
         annos = getattr(cls, "__annotations__", {})
+        max_items = getattr(cls, "_max_items", {})
         dummy = object()
         for name, annotation in annos.items():
             default=getattr(cls, name, inspect.Parameter.empty)
@@ -66,6 +67,9 @@ class Component:
                     ok, value = _validate_value(value, annos[name])
                     if not ok:
                         raise ValueError("Paramter {} must be of type {}".format(name, annos[name]))
+                    if name in max_items and len(value) > max_items[name]:
+                        raise ValueError("Parameter {} may have at most {} items".format(
+                            name, max_items[name]))
                     self.__dict__[name] = value
         __init__.__qualname__ = f"{cls.__qualname__}.__init__"
         __init__.__signature__ = inspect.Signature(params)
@@ -0,0 +1,288 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""A disk-backed, memory-mapped cache of rendered payloads shared between processes"""
+
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+import threading
+import weakref
+import contextlib
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover
+    fcntl = None
+
+# File layout:
+#   A fixed size header, followed by a table of slot entries, followed by the data region
+#   which is divided into equal sized slots. Slots are grouped into sets of `ways` slots;
+#   a key can only live in the set selected by its hash, and when a set is full the least
+#   recently used slot in that set is evicted.
+_MAGIC = b"BKRCACHE"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIII")
+_HEADER_SIZE = 64
+_ENTRY = struct.Struct("<32sQI4x")
+_KEY_SIZE = 32
+_EMPTY_KEY = bytes(_KEY_SIZE)
+
+
+# Open caches, so that their thread locks can be reset in a forked child
+_instances = weakref.WeakSet()
+
+
+def _after_fork():
+    for cache in _instances:
+        cache._thread_lock = threading.Lock() # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _align(value, alignment=64):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _digest(key):
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    return hashlib.blake2b(key, digest_size=_KEY_SIZE).digest()
+
+
+def _canonical(component):
+    return json.dumps(component.asdict(), sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(component):
+    """Return a stable hash of the content of a component tree.
+
+    Computing the hash serialises the whole tree, so this is only worthwhile when the
+    payload is shared by processes that cannot agree on a key any other way.
+    """
+    return _digest(_canonical(component)).hex()
+
+
+class RenderCache:
+    """A size bounded cache mapping keys to pre-encoded JSON payloads, stored in a
+    memory-mapped file so that it can be shared by several processes.
+
+    The cache holds `slots` entries of at most `slot_size` bytes each. Payloads that are
+    larger than a slot are never cached. Eviction is least-recently-used within each
+    set of `ways` slots. Writers take an exclusive lock on the file and readers take a
+    shared lock, so concurrent use from several processes is safe on platforms that
+    support `fcntl` locking. An instance may be shared between threads, and may be
+    opened before forking worker processes.
+
+    `get()` returns the payload as `bytes`, copied out of the mapping while the lock is
+    held, since a slot can be rewritten by another process at any time after the lock
+    is released. To avoid the copy, `view()` lends a `memoryview` of the slot for the
+    duration of a `with` block, holding the lock until the block exits.
+
+    To avoid rendering at all on a hit, key entries on the inputs used to build the
+    component and use `get_or_render()`. Processes that cannot agree on such keys can
+    use `render()`, which keys the payload on the content hash of the component.
+    """
+    def __init__(self, path, slots=1024, slot_size=65536, ways=8):
+        if slots <= 0 or slot_size <= 0 or ways <= 0 or slots % ways:
+            raise ValueError("slots must be a positive multiple of ways")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ways = ways
+        self._data_offset = _align(_HEADER_SIZE + slots * _ENTRY.size)
+        total_size = self._data_offset + slots * slot_size
+        # flock() locks belong to the open file, so each thread must be serialised and
+        # each process needs its own file descriptor
+        self._thread_lock = threading.Lock()
+        self._pid = os.getpid()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._lock(True)
+            try:
+                if os.fstat(self._fd).st_size == 0:
+                    os.ftruncate(self._fd, total_size)
+                    os.write(self._fd, _HEADER.pack(_MAGIC, _VERSION, slots, slot_size, ways))
+                else:
+                    header = os.read(self._fd, _HEADER.size)
+                    if header != _HEADER.pack(_MAGIC, _VERSION, slots, slot_size, ways):
+                        raise ValueError("Cache file {} has an incompatible layout".format(path))
+            finally:
+                self._unlock()
+            self._mmap = mmap.mmap(self._fd, total_size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        _instances.add(self)
+
+    def _lock(self, exclusive):
+        self._thread_lock.acquire()
+        try:
+            if self._fd is None:
+                raise ValueError("Cache {} is closed".format(self.path))
+            if self._pid != os.getpid():
+                # The descriptor was inherited from our parent, which still shares its lock
+                os.close(self._fd)
+                self._fd = os.open(self.path, os.O_RDWR)
+                self._pid = os.getpid()
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def _unlock(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+
+    def _entry_offset(self, slot):
+        return _HEADER_SIZE + slot * _ENTRY.size
+
+    def _set_slots(self, digest):
+        first = int.from_bytes(digest[:8], "little") % (self.slots // self.ways) * self.ways
+        return range(first, first + self.ways)
+
+    def _find(self, digest):
+        # Returns (slot, entry) for the matching slot, or (None, None)
+        for slot in self._set_slots(digest):
+            entry = _ENTRY.unpack_from(self._mmap, self._entry_offset(slot))
+            if entry[0] == digest:
+                return slot, entry
+        return None, None
+
+    def _touch(self, slot, entry):
+        _ENTRY.pack_into(self._mmap, self._entry_offset(slot), entry[0], time.time_ns(), entry[2])
+
+    def _lookup(self, key):
+        # Returns (start, length) of the payload, or None; the caller holds the lock
+        slot, entry = self._find(_digest(key))
+        if slot is None:
+            return None
+        # Updating the timestamp under a shared lock can race with other readers, but
+        # any of the competing values is good enough for LRU ordering.
+        self._touch(slot, entry)
+        return self._data_offset + slot * self.slot_size, entry[2]
+
+    def get(self, key):
+        """Return a copy of the payload stored under `key`, or None if it is absent"""
+        self._lock(False)
+        try:
+            found = self._lookup(key)
+            if found is None:
+                return None
+            start, length = found
+            return self._mmap[start:start + length]
+        finally:
+            self._unlock()
+
+    @contextlib.contextmanager
+    def view(self, key):
+        """Lend a memoryview of the payload stored under `key`, or None if it is absent.
+
+        The view is only valid inside the `with` block, which holds a shared lock on the
+        cache, so writers in all processes and other threads using this instance wait
+        until it exits. Keep the block short, for instance a single socket write, and do
+        not call other methods of the cache inside it.
+        """
+        self._lock(False)
+        try:
+            found = self._lookup(key)
+            if found is None:
+                yield None
+                return
+            start, length = found
+            with memoryview(self._mmap) as mapped, mapped[start:start + length] as payload:
+                yield payload
+        finally:
+            self._unlock()
+
+    def put(self, key, data):
+        """Store the encoded payload `data` under `key`.
+
+        Returns True if the payload was stored, or False if it is too large to cache.
+        """
+        if len(data) > self.slot_size:
+            return False
+        digest = _digest(key)
+        self._lock(True)
+        try:
+            slot, _ = self._find(digest)
+            if slot is None:
+                slot = min(self._set_slots(digest),
+                           key=lambda s: _ENTRY.unpack_from(self._mmap, self._entry_offset(s))[1])
+            offset = self._entry_offset(slot)
+            # Invalidate the slot before rewriting its data so a crashed writer cannot
+            # leave a key pointing at a partial payload.
+            _ENTRY.pack_into(self._mmap, offset, _EMPTY_KEY, 0, 0)
+            start = self._data_offset + slot * self.slot_size
+            self._mmap[start:start + len(data)] = data
+            _ENTRY.pack_into(self._mmap, offset, digest, time.time_ns(), len(data))
+            return True
+        finally:
+            self._unlock()
+
+    def get_or_render(self, key, factory):
+        """Return the payload for `key`, calling `factory` to build the component on a miss.
+
+        Keying on a hash of the inputs to `factory` avoids both constructing and
+        serialising the component tree when the payload is already cached.
+        """
+        payload = self.get(key)
+        if payload is None:
+            payload = factory().json().encode("utf-8")
+            self.put(key, payload)
+        return payload
+
+    def render(self, component):
+        """Return the encoded payload for a component, keyed by its content hash.
+
+        This serialises the component on every call, to compute the hash; prefer
+        `get_or_render()` when a key can be derived from the component's inputs.
+        """
+        data = _canonical(component)
+        key = _digest(data).hex()
+        payload = self.get(key)
+        if payload is None:
+            payload = data
+            self.put(key, payload)
+        return payload
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        self._lock(True)
+        try:
+            for slot in range(self.slots):
+                _ENTRY.pack_into(self._mmap, self._entry_offset(slot), _EMPTY_KEY, 0, 0)
+        finally:
+            self._unlock()
+
+    def close(self):
+        """Unmap and close the cache file"""
+        with self._thread_lock:
+            if self._fd is not None:
+                try:
+                    self._mmap.close()
+                finally:
+                    os.close(self._fd)
+                    self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
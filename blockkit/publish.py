@@ -0,0 +1,110 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Incremental publishing of home tabs for many users"""
+
+from .base import Block
+from .views import HomeTab, MAX_BLOCKS
+
+
+class HomeTabPublisher:
+    """Keeps the last published home tab for each user and republishes only what changed.
+
+    A home tab is described as a list of `(key, inputs)` pairs, one per block. The
+    `render` function is called as `render(key, inputs)` and must return a Block. A
+    block is only re-rendered when its inputs differ from those last published for
+    that user, and up to `cache_size` recently rendered blocks are shared between
+    users, so `inputs` must be hashable and rendering must depend on nothing else.
+
+    Payloads for the `views.publish` API method are queued and passed to `sender` as
+    lists of up to `batch_size` dictionaries. Call `flush()` to send any remainder.
+    A user's view is only recorded as published once `sender` returns; if it raises,
+    the batch stays queued and is sent again by the next `flush()`. Block dictionaries
+    are shared between payloads and must not be modified.
+
+    Any other keyword arguments are HomeTab parameters, such as `callback_id`, that
+    are included in every view.
+    """
+    def __init__(self, render, sender, batch_size=100, cache_size=10000, **view_args):
+        # pylint: disable=too-many-arguments
+        self.render = render
+        self.sender = sender
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        if "blocks" in view_args:
+            raise ValueError("Blocks are passed to update(), not to the publisher")
+        # Constructing a HomeTab validates the arguments and gives the view's field order
+        self._view_template = HomeTab(blocks=[], **view_args).asdict()
+        self._published = {}
+        self._rendered = {}
+        # Maps user_id to (payload, blocks, rendered) for views that are not yet sent
+        self._pending = {}
+
+    def _render(self, key, inputs):
+        cache_key = (key, inputs)
+        block = self._rendered.get(cache_key)
+        if block is None:
+            if len(self._rendered) >= self.cache_size:
+                self._rendered.clear()
+            block = self.render(key, inputs)
+            if not isinstance(block, Block):
+                raise ValueError("Rendering {!r} returned {!r}, which is not a Block".format(
+                    key, block))
+            block = block.asdict()
+            self._rendered[cache_key] = block
+        return block
+
+    def update(self, user_id, blocks):
+        """Queue a publish for `user_id` if any block differs from the last published view.
+
+        Returns True if a payload was queued.
+        """
+        blocks = list(blocks)
+        if len(blocks) > MAX_BLOCKS:
+            raise ValueError("A home tab may have at most {} blocks".format(MAX_BLOCKS))
+
+        previous_inputs, previous_blocks = self._published.get(user_id, ((), ()))
+        if user_id in self._pending:
+            if blocks == previous_inputs:
+                # Back to what was last sent, so the queued change can be dropped
+                del self._pending[user_id]
+                return False
+            _, previous_inputs, previous_blocks = self._pending[user_id]
+        if blocks == previous_inputs:
+            return False
+        rendered = []
+        for i, (key, inputs) in enumerate(blocks):
+            if i < len(previous_inputs) and previous_inputs[i] == (key, inputs):
+                rendered.append(previous_blocks[i])
+            else:
+                rendered.append(self._render(key, inputs))
+
+        view = dict(self._view_template)
+        view["blocks"] = rendered
+        self._pending[user_id] = ({"user_id": user_id, "view": view}, blocks, rendered)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    def forget(self, user_id):
+        """Discard the published and queued state for a user.
+
+        Any queued view for the user is dropped, and their next update is sent in full.
+        """
+        self._published.pop(user_id, None)
+        self._pending.pop(user_id, None)
+
+    def flush(self):
+        """Send any queued payloads"""
+        while self._pending:
+            users = list(self._pending)[:self.batch_size]
+            self.sender([self._pending[user_id][0] for user_id in users])
+            for user_id in users:
+                _, blocks, rendered = self._pending.pop(user_id)
+                self._published[user_id] = (blocks, rendered)
@@ -0,0 +1,241 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""JSON Schema export and validation of raw dictionaries against component types"""
+
+import typing
+import inspect
+
+from .base import Component, Element, Block
+from .views import View
+
+_SCALARS = {str: "string", bool: "boolean", int: "integer", float: "number"}
+
+
+class ValidationError(ValueError):
+    """Raised when a raw dictionary does not match a component type"""
+    def __init__(self, message, path=()):
+        super().__init__(message)
+        self.message = message
+        self.path = list(path)
+
+    def __str__(self):
+        if not self.path:
+            return self.message
+        return "{}: {}".format("".join(self.path).lstrip("."), self.message)
+
+
+def _fields(cls):
+    """Return (json_name, annotation, required) for each field of a component class"""
+    result = []
+    for name, annotation in getattr(cls, "__annotations__", {}).items():
+        required = getattr(cls, name, inspect.Parameter.empty) is inspect.Parameter.empty
+        result.append(("type" if name == "_type" else name, annotation, required))
+    return result
+
+
+def _tag(cls):
+    # A `_type` class attribute is a fixed type tag; a `_type` field is ordinary data
+    if "_type" not in getattr(cls, "__annotations__", {}):
+        return getattr(cls, "_type", None)
+    return None
+
+
+def _concrete_subclasses(cls):
+    """Return all the concrete classes that can appear where `cls` is expected"""
+    result = []
+    pending = [cls]
+    while pending:
+        klass = pending.pop(0)
+        if klass not in (Element, Block, View) and klass not in result:
+            result.append(klass)
+        pending.extend(klass.__subclasses__())
+    return result
+
+
+# JSON Schema export
+def _annotation_schema(annotation, defs):
+    if typing.get_origin(annotation) == list:
+        return {"type": "array", "items": _annotation_schema(annotation.__args__[0], defs)}
+    if typing.get_origin(annotation) == typing.Union:
+        return {"anyOf": [_annotation_schema(a, defs) for a in annotation.__args__]}
+    if annotation in _SCALARS:
+        return {"type": _SCALARS[annotation]}
+    if isinstance(annotation, type) and issubclass(annotation, Component):
+        options = [_class_schema(c, defs) for c in _concrete_subclasses(annotation)]
+        return options[0] if len(options) == 1 else {"anyOf": options}
+    raise TypeError("No JSON Schema for type {}".format(annotation))
+
+
+def _class_schema(cls, defs):
+    ref = {"$ref": "#/$defs/{}".format(cls.__name__)}
+    if cls.__name__ in defs:
+        return ref
+    schema = {"type": "object", "properties": {}, "required": [],
+              "additionalProperties": False}
+    if cls.__doc__:
+        schema["description"] = inspect.cleandoc(cls.__doc__).split("\n")[0]
+    defs[cls.__name__] = schema
+    tag = _tag(cls)
+    if tag is not None:
+        schema["properties"]["type"] = {"const": tag}
+        schema["required"].append("type")
+    max_items = getattr(cls, "_max_items", {})
+    for name, annotation, required in _fields(cls):
+        schema["properties"][name] = _annotation_schema(annotation, defs)
+        if name in max_items:
+            schema["properties"][name]["maxItems"] = max_items[name]
+        if required:
+            schema["required"].append(name)
+    return ref
+
+
+def json_schema(cls):
+    """Generate a JSON Schema document describing the dictionary form of a component class"""
+    defs = {}
+    root = _annotation_schema(cls, defs)
+    result = {"$schema": "https://json-schema.org/draft/2020-12/schema"}
+    result.update(root)
+    result["$defs"] = defs
+    return result
+
+
+# Compiled validators for raw dictionaries
+def _compile_annotation(annotation, checkers):
+    # pylint: disable=too-many-return-statements
+    if typing.get_origin(annotation) == list:
+        item_check = _compile_annotation(annotation.__args__[0], checkers)
+        def check_list(value):
+            if not isinstance(value, list):
+                raise ValidationError("must be a list")
+            for i, item in enumerate(value):
+                try:
+                    item_check(item)
+                except ValidationError as exc:
+                    exc.path.insert(0, "[{}]".format(i))
+                    raise
+        return check_list
+
+    if typing.get_origin(annotation) == typing.Union:
+        return _compile_choice([_compile_annotation(a, checkers) for a in annotation.__args__])
+
+    if isinstance(annotation, type) and issubclass(annotation, Component):
+        classes = _concrete_subclasses(annotation)
+        tagged = {}
+        untagged = []
+        for klass in classes:
+            tag = _tag(klass)
+            if tag is None:
+                untagged.append(_compile_class(klass, checkers))
+            else:
+                tagged.setdefault(tag, []).append(_compile_class(klass, checkers))
+        if not tagged:
+            return _compile_choice(untagged)
+        tagged = {tag: _compile_choice(checks) for tag, checks in tagged.items()}
+        untagged_check = _compile_choice(untagged) if untagged else None
+        def check_tagged(value):
+            if not isinstance(value, dict):
+                raise ValidationError("must be of type {}".format(annotation.__name__))
+            tag = value.get("type")
+            if tag is not None and not isinstance(tag, str):
+                raise ValidationError("type must be a string")
+            check = tagged.get(tag, untagged_check)
+            if check is None:
+                raise ValidationError("type {!r} is not a valid {}".format(
+                    tag, annotation.__name__))
+            check(value)
+        return check_tagged
+
+    # JSON has no integer booleans, and JSON numbers may be written as integers
+    accepted = (int, float) if annotation is float else annotation
+    rejected = bool if annotation in (int, float) else ()
+    def check_instance(value):
+        if not isinstance(value, accepted) or isinstance(value, rejected):
+            raise ValidationError("must be of type {}".format(annotation.__name__))
+    return check_instance
+
+
+def _compile_choice(checks):
+    if len(checks) == 1:
+        return checks[0]
+    def check_choice(value):
+        errors = []
+        for check in checks:
+            try:
+                check(value)
+                return
+            except ValidationError as exc:
+                errors.append(exc)
+        # Report the error from the option that got furthest into the value
+        raise max(errors, key=lambda e: len(e.path))
+    return check_choice
+
+
+def _compile_class(cls, checkers):
+    if cls in checkers:
+        return checkers[cls]
+    # Register before compiling the fields so that recursive types terminate
+    fields = {}
+    required = []
+    tag = _tag(cls)
+    max_items = getattr(cls, "_max_items", {})
+    def check_struct(value):
+        if not isinstance(value, dict):
+            raise ValidationError("must be of type {}".format(cls.__name__))
+        if tag is not None and value.get("type") != tag:
+            raise ValidationError("type must be {!r}".format(tag))
+        for name in required:
+            if name not in value:
+                raise ValidationError("missing required parameter", [".{}".format(name)])
+        for name, item in value.items():
+            check = fields.get(name)
+            if check is None:
+                if name == "type" and tag is not None:
+                    continue
+                raise ValidationError("unexpected parameter", [".{}".format(name)])
+            try:
+                check(item)
+                if name in max_items and len(item) > max_items[name]:
+                    raise ValidationError("may have at most {} items".format(max_items[name]))
+            except ValidationError as exc:
+                exc.path.insert(0, ".{}".format(name))
+                raise
+    checkers[cls] = check_struct
+    for name, annotation, is_required in _fields(cls):
+        fields[name] = _compile_annotation(annotation, checkers)
+        if is_required:
+            required.append(name)
+    return check_struct
+
+
+def compile_validator(cls):
+    """Compile a function that checks a raw dictionary against a component class.
+
+    The returned function raises ValidationError if the value would not be accepted
+    when constructing `cls`, and returns None otherwise. Booleans are not accepted
+    where an integer is expected, matching the JSON Schema. Subclasses defined after
+    this call are not recognised by the returned function; compile it again to
+    include them.
+    """
+    return _compile_annotation(cls, {})
+
+
+_validators = {}
+
+
+def validate(value, cls):
+    """Check that a raw dictionary (or list) matches a component type or annotation.
+
+    The validator for each type is compiled on first use and then reused, so it does
+    not recognise subclasses defined afterwards. Use `compile_validator()` for those.
+    """
+    check = _validators.get(cls)
+    if check is None:
+        check = _validators[cls] = compile_validator(cls)
+    check(value)
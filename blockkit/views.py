@@ -0,0 +1,57 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+# pylint: disable=too-few-public-methods
+
+"""Types of view (modals and home tabs) used by the Block Kit API"""
+
+from typing import List
+from .base import Block, Component
+
+from .components import Text
+
+# The largest number of blocks that a view may contain
+MAX_BLOCKS = 100
+
+
+class View(Component):
+    """Base class for views that can be opened or published with the Slack API"""
+    _max_items = {"blocks": MAX_BLOCKS}
+
+
+class Modal(View):
+    """A modal view.
+
+    See the `Slack API <https://api.slack.com/reference/surfaces/views#modal>`
+    for details.
+    """
+    _type = "modal"
+    title: Text
+    blocks: List[Block]
+    close: Text = None
+    submit: Text = None
+    private_metadata: str = None
+    callback_id: str = None
+    clear_on_close: bool = None
+    notify_on_close: bool = None
+    external_id: str = None
+    submit_disabled: bool = None
+
+
+class HomeTab(View):
+    """A view displayed in the app's Home tab.
+
+    See the `Slack API <https://api.slack.com/reference/surfaces/views#home>`
+    for details.
+    """
+    _type = "home"
+    blocks: List[Block]
+    private_metadata: str = None
+    callback_id: str = None
+    external_id: str = None
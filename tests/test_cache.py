@@ -0,0 +1,163 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the memory-mapped render cache"""
+
+import os
+import time
+import tempfile
+import unittest
+import multiprocessing
+
+from blockkit import RenderCache, Divider, Section, content_hash
+
+
+def _writer(path, worker, count):
+    with RenderCache(path, slots=4096, slot_size=1024) as cache:
+        for i in range(count):
+            cache.put("{}-{}".format(worker, i), "{}-{};".format(worker, i).encode() * 50)
+
+
+class RenderCacheTest(unittest.TestCase):
+    """Tests for RenderCache"""
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "render.cache")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            self.assertIsNone(cache.get("a"))
+            self.assertTrue(cache.put("a", b'{"a":1}'))
+            self.assertEqual(cache.get("a"), b'{"a":1}')
+            self.assertFalse(cache.put("big", b"x" * 65))
+            self.assertIsNone(cache.get("big"))
+            cache.clear()
+            self.assertIsNone(cache.get("a"))
+
+    def test_payload_survives_eviction(self):
+        with RenderCache(self.path, slots=2, slot_size=64, ways=2) as cache:
+            cache.put("a", b'{"a":1}')
+            payload = cache.get("a")
+            cache.put("b", b'{"b":22}')
+            cache.put("c", b'{"c":333}')
+            self.assertEqual(payload, b'{"a":1}')
+            self.assertIsNone(cache.get("a"))
+
+    def test_lru_eviction(self):
+        with RenderCache(self.path, slots=4, slot_size=64, ways=4) as cache:
+            for key in "abcd":
+                cache.put(key, key.encode())
+                time.sleep(0.001)
+            cache.get("a")
+            cache.put("e", b"e")
+            self.assertIsNone(cache.get("b"))
+            for key in "acde":
+                self.assertEqual(cache.get(key), key.encode())
+
+    def test_reopen(self):
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            cache.put("a", b"1")
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            self.assertEqual(cache.get("a"), b"1")
+        with self.assertRaises(ValueError):
+            RenderCache(self.path, slots=32, slot_size=64, ways=4)
+
+    def test_close(self):
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            cache.put("a", b"1")
+            payload = cache.get("a")
+        self.assertEqual(payload, b"1")
+        with self.assertRaises(ValueError):
+            cache.get("a")
+        cache.close()
+
+    def test_get_or_render(self):
+        calls = []
+        def factory():
+            calls.append(1)
+            return Divider()
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            self.assertEqual(cache.get_or_render("d", factory), b'{"type": "divider"}')
+            self.assertEqual(cache.get_or_render("d", factory), b'{"type": "divider"}')
+        self.assertEqual(len(calls), 1)
+
+    def test_view(self):
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            cache.put("a", b'{"a":1}')
+            with cache.view("a") as payload:
+                self.assertIsInstance(payload, memoryview)
+                self.assertEqual(payload, b'{"a":1}')
+            with self.assertRaises(ValueError):
+                payload.tobytes()
+            with cache.view("b") as payload:
+                self.assertIsNone(payload)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_view_blocks_writers(self):
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            cache.put("a", b'{"a":1}')
+            context = multiprocessing.get_context("fork")
+            with cache.view("a") as payload:
+                child = context.Process(target=cache.put, args=("a", b'{"a":2}'))
+                child.start()
+                child.join(0.5)
+                self.assertTrue(child.is_alive())
+                self.assertEqual(payload, b'{"a":1}')
+            child.join(5)
+            self.assertEqual(child.exitcode, 0)
+            self.assertEqual(cache.get("a"), b'{"a":2}')
+
+    def test_render(self):
+        section = Section(text="hello")
+        with RenderCache(self.path, slots=16, slot_size=256, ways=4) as cache:
+            payload = cache.render(section)
+            self.assertEqual(payload, b'{"text":{"text":"hello","type":"plain_text"},'
+                                      b'"type":"section"}')
+            self.assertEqual(cache.get(content_hash(section)), payload)
+            self.assertEqual(content_hash(Section(text="hello")), content_hash(section))
+            self.assertNotEqual(content_hash(Section(text="bye")), content_hash(section))
+
+    def test_concurrent_writers(self):
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=_writer, args=(self.path, i, 200)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        with RenderCache(self.path, slots=4096, slot_size=1024) as cache:
+            for i in range(4):
+                for j in range(200):
+                    # The cache is large enough that nothing should have been evicted
+                    self.assertEqual(cache.get("{}-{}".format(i, j)),
+                                     "{}-{};".format(i, j).encode() * 50)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_lock_after_fork(self):
+        with RenderCache(self.path, slots=16, slot_size=64, ways=4) as cache:
+            context = multiprocessing.get_context("fork")
+            cache._lock(True) # pylint: disable=protected-access
+            try:
+                child = context.Process(target=cache.put, args=("a", b"1"))
+                child.start()
+                # The child must wait for the parent's exclusive lock
+                child.join(0.5)
+                self.assertTrue(child.is_alive())
+            finally:
+                cache._unlock() # pylint: disable=protected-access
+            child.join(5)
+            self.assertEqual(child.exitcode, 0)
+            self.assertEqual(cache.get("a"), b"1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for incremental home tab publishing"""
+
+import unittest
+
+from blockkit import HomeTab, HomeTabPublisher, Button, Divider, Header
+
+
+def _render(key, inputs):
+    return Header(text="{} {}".format(key, inputs)) if inputs else Divider()
+
+
+class HomeTabPublisherTest(unittest.TestCase):
+    """Tests for HomeTabPublisher"""
+    def setUp(self):
+        self.sent = []
+        self.failing = False
+        self.renders = []
+
+    def sender(self, batch):
+        """Record a batch, or fail if asked to"""
+        if self.failing:
+            raise RuntimeError("send failed")
+        self.sent.append(batch)
+
+    def render(self, key, inputs):
+        """Render a block and count the calls"""
+        self.renders.append((key, inputs))
+        return _render(key, inputs)
+
+    def test_only_changes_are_rendered(self):
+        publisher = HomeTabPublisher(self.render, self.sender, callback_id="home")
+        self.assertTrue(publisher.update("U1", [("a", 1), ("b", 0)]))
+        self.assertTrue(publisher.update("U2", [("a", 1), ("b", 0)]))
+        publisher.flush()
+        self.assertEqual(len(self.renders), 2)
+        self.assertEqual(self.sent[0][0], {"user_id": "U1", "view": {
+            "type": "home", "blocks": [{"type": "header", "text": {"type": "plain_text",
+                                                                    "text": "a 1"}},
+                                       {"type": "divider"}],
+            "callback_id": "home"}})
+        self.assertFalse(publisher.update("U1", [("a", 1), ("b", 0)]))
+        self.assertTrue(publisher.update("U1", [("a", 2), ("b", 0)]))
+        self.assertEqual(self.renders[-1], ("a", 2))
+        self.assertEqual(len(self.renders), 3)
+
+    def test_batching(self):
+        publisher = HomeTabPublisher(self.render, self.sender, batch_size=2)
+        for user in range(5):
+            publisher.update("U{}".format(user), [("a", 1)])
+        publisher.flush()
+        self.assertEqual([len(batch) for batch in self.sent], [2, 2, 1])
+
+    def test_failed_send_is_retried(self):
+        publisher = HomeTabPublisher(self.render, self.sender)
+        publisher.update("U1", [("a", 1)])
+        self.failing = True
+        with self.assertRaises(RuntimeError):
+            publisher.flush()
+        self.failing = False
+        publisher.update("U1", [("a", 1)])
+        publisher.flush()
+        self.assertEqual([payload["user_id"] for payload in self.sent[0]], ["U1"])
+        self.assertFalse(publisher.update("U1", [("a", 1)]))
+
+    def test_reverted_change_is_dropped(self):
+        publisher = HomeTabPublisher(self.render, self.sender)
+        publisher.update("U1", [("a", 1)])
+        publisher.flush()
+        self.assertTrue(publisher.update("U1", [("a", 2)]))
+        self.assertFalse(publisher.update("U1", [("a", 1)]))
+        publisher.flush()
+        self.assertEqual(len(self.sent), 1)
+
+    def test_forget(self):
+        publisher = HomeTabPublisher(self.render, self.sender)
+        publisher.update("U1", [("a", 1)])
+        publisher.flush()
+        publisher.update("U1", [("a", 2)])
+        publisher.forget("U1")
+        publisher.flush()
+        self.assertEqual(len(self.sent), 1)
+        # With no record of what was sent, the same view is published again
+        self.assertTrue(publisher.update("U1", [("a", 1)]))
+        publisher.flush()
+        self.assertEqual(len(self.sent), 2)
+
+    def test_render_must_return_block(self):
+        publisher = HomeTabPublisher(lambda key, inputs: Button(text="Go", action_id="go"),
+                                     self.sender)
+        with self.assertRaises(ValueError):
+            publisher.update("U1", [("a", 1)])
+
+    def test_view_arguments(self):
+        with self.assertRaises(ValueError):
+            HomeTabPublisher(self.render, self.sender, callback_id=5)
+        with self.assertRaises(ValueError):
+            HomeTabPublisher(self.render, self.sender, blocks="oops")
+        with self.assertRaises(ValueError):
+            HomeTabPublisher(self.render, self.sender).update("U1", [("a", 1)] * 101)
+
+    def test_block_limit(self):
+        with self.assertRaises(ValueError):
+            HomeTab(blocks=[Divider()] * 101)
+
+
+if __name__ == "__main__":
+    unittest.main()
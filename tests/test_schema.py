@@ -0,0 +1,92 @@
+# BlockKit: A Pythonic library for constructing Slack Block Kit API structures.
+
+# Copyright 2021 Nicko van Someren
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# See the LICENSE.txt file for details
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for JSON Schema export and raw dictionary validation"""
+
+import unittest
+
+from blockkit import (
+    Block, Message, Section, Actions, Button, Divider, Text, MultiUsersSelect,
+    ValidationError, compile_validator, json_schema, validate)
+
+
+class ValidateTest(unittest.TestCase):
+    """Tests for validate()"""
+    def setUp(self):
+        self.message = Message(channel="C1", blocks=[
+            Section(text=Text("*hi*", Text.MARKDOWN), fields=["a", "b"]),
+            Actions(elements=[Button(text="Go", action_id="go")]),
+            Divider()]).asdict()
+
+    def assertInvalid(self, value, message):
+        """Check that validation fails with the given message"""
+        with self.assertRaises(ValidationError) as context:
+            validate(value, Message)
+        self.assertEqual(str(context.exception), message)
+
+    def test_valid(self):
+        validate(self.message, Message)
+
+    def test_missing_parameter(self):
+        del self.message["blocks"][1]["elements"][0]["action_id"]
+        self.assertInvalid(self.message, "blocks[1].elements[0].action_id: missing required parameter")
+
+    def test_unexpected_parameter(self):
+        self.message["blocks"][2]["colour"] = "red"
+        self.assertInvalid(self.message, "blocks[2].colour: unexpected parameter")
+
+    def test_wrong_type(self):
+        self.message["blocks"][0]["text"] = "plain"
+        self.assertInvalid(self.message, "blocks[0].text: must be of type Text")
+
+    def test_unhashable_type_tag(self):
+        self.assertInvalid({"channel": "C", "blocks": [{"type": []}]},
+                           "blocks[0]: type must be a string")
+
+    def test_unknown_type_tag(self):
+        self.assertInvalid({"channel": "C", "blocks": [{"type": "nope"}]},
+                           "blocks[0]: type 'nope' is not a valid Block")
+
+    def test_boolean_is_not_an_integer(self):
+        select = MultiUsersSelect(placeholder="Who?", action_id="who",
+                                  max_selected_items=3).asdict()
+        self.message["blocks"][1]["elements"].append(select)
+        validate(self.message, Message)
+        # The constructor accepts True for an int, but JSON Schema "integer" does not
+        select["max_selected_items"] = True
+        self.assertInvalid(self.message,
+                           "blocks[1].elements[1].max_selected_items: must be of type int")
+        self.assertEqual(json_schema(MultiUsersSelect)["$defs"]["MultiUsersSelect"]
+                         ["properties"]["max_selected_items"], {"type": "integer"})
+
+    def test_new_subclass_needs_recompiling(self):
+        before = compile_validator(Message)
+        class Poll(Block): # pylint: disable=unused-variable
+            """A block type defined after the first compilation"""
+            question: str
+        poll = {"channel": "C", "blocks": [{"type": "poll", "question": "Lunch?"}]}
+        with self.assertRaises(ValidationError):
+            before(poll)
+        compile_validator(Message)(poll)
+
+
+class JSONSchemaTest(unittest.TestCase):
+    """Tests for json_schema()"""
+    def test_section(self):
+        schema = json_schema(Section)
+        self.assertEqual(schema["$ref"], "#/$defs/Section")
+        section = schema["$defs"]["Section"]
+        self.assertEqual(section["properties"]["type"], {"const": "section"})
+        self.assertEqual(section["required"], ["type"])
+        self.assertFalse(section["additionalProperties"])
+        self.assertIn("Text", schema["$defs"])
+
+
+if __name__ == "__main__":
+    unittest.main()